@@ -0,0 +1,176 @@
+# framePool.py
+# Fixed-budget storage for camera frames and telemetry on the Pi Zero W
+# (512 MB RAM). Everything is allocated once up front and reused, so a
+# capture/vision/logging pipeline keeps a flat resident size however long
+# it runs. Frames are copied into preallocated slots instead of keeping
+# the buffers the camera hands out.
+import os
+import resource
+from array import array
+
+_stages = {}  # stage name -> list of pools registered under it
+
+
+# -----------------------
+# Frame pool
+# -----------------------
+
+class FramePool:
+    """
+    Ring of `slots` preallocated frame buffers of width*height*channels bytes.
+
+    put() copies a frame into the next free slot; when the pool is full the
+    oldest unread frame is overwritten (and counted in `dropped`), so a slow
+    consumer never makes the pool grow. get() returns a memoryview of the
+    oldest unread slot, valid until `slots` more frames have been put.
+    """
+
+    def __init__(self, width, height, channels=1, slots=4):
+        self.width, self.height, self.channels = width, height, channels
+        self.frame_bytes = width * height * channels
+        self.slots = slots
+        self._buf = bytearray(self.frame_bytes * slots)
+        self._views = [memoryview(self._buf)[i * self.frame_bytes:(i + 1) * self.frame_bytes]
+                       for i in range(slots)]
+        self._read = 0   # total frames read
+        self._write = 0  # total frames written
+        self.dropped = 0
+
+    @property
+    def nbytes(self):
+        return len(self._buf)
+
+    def __len__(self):
+        return self._write - self._read
+
+    def put(self, frame, stride=None):
+        """
+        Copy a frame into the next slot and return that slot.
+
+        frame is any contiguous buffer (bytes, memoryview, numpy array). With
+        stride, rows are `stride` bytes apart in frame and only the first
+        width*channels bytes of each of the first `height` rows are kept,
+        which is how the Y plane is lifted out of a padded YUV420 buffer.
+        """
+        row_bytes = self.width * self.channels
+        stride = stride or row_bytes
+        src = memoryview(frame).cast("B")
+        if len(src) < stride * (self.height - 1) + row_bytes:
+            raise ValueError(f"frame is {len(src)} bytes, too small for {self.width}x{self.height}")
+        if len(self) == self.slots:
+            self._read += 1
+            self.dropped += 1
+        slot = self._views[self._write % self.slots]
+        if stride == row_bytes:
+            slot[:] = src[:self.frame_bytes]
+        else:
+            for row in range(self.height):
+                slot[row * row_bytes:(row + 1) * row_bytes] = src[row * stride:row * stride + row_bytes]
+        self._write += 1
+        return slot
+
+    def get(self):
+        """Oldest unread frame as a memoryview, or None if the pool is empty"""
+        if not len(self):
+            return None
+        slot = self._views[self._read % self.slots]
+        self._read += 1
+        return slot
+
+    def latest(self):
+        """Most recently written frame (without consuming anything), or None"""
+        if not self._write:
+            return None
+        return self._views[(self._write - 1) % self.slots]
+
+
+# -----------------------
+# Telemetry log
+# -----------------------
+
+class TelemetryLog:
+    """
+    Fixed-capacity ring of float records, e.g. TelemetryLog(("t", "fps"), 3600).
+
+    Backed by one array('d'); once full, each append overwrites the oldest
+    record (counted in `dropped`).
+    """
+
+    def __init__(self, fields, capacity):
+        self.fields = tuple(fields)
+        self.capacity = capacity
+        self._data = array("d", bytes(8 * len(self.fields) * capacity))
+        self._count = 0
+        self.dropped = 0
+
+    @property
+    def nbytes(self):
+        return self._data.itemsize * len(self._data)
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    def append(self, *values):
+        if len(values) != len(self.fields):
+            raise ValueError(f"expected {len(self.fields)} values {self.fields}, got {len(values)}")
+        if self._count >= self.capacity:
+            self.dropped += 1
+        start = (self._count % self.capacity) * len(self.fields)
+        for i, value in enumerate(values):
+            self._data[start + i] = value
+        self._count += 1
+
+    def records(self):
+        """Yield stored records as tuples, oldest first"""
+        n = len(self.fields)
+        first = self._count - len(self)
+        for i in range(first, self._count):
+            start = (i % self.capacity) * n
+            yield tuple(self._data[start:start + n])
+
+    def last(self):
+        if not self._count:
+            return None
+        n = len(self.fields)
+        start = ((self._count - 1) % self.capacity) * n
+        return tuple(self._data[start:start + n])
+
+
+# -----------------------
+# Memory accounting
+# -----------------------
+
+def register(stage, pool):
+    """Account a FramePool/TelemetryLog (anything with .nbytes) to a pipeline stage"""
+    _stages.setdefault(stage, []).append(pool)
+    return pool
+
+
+def unregister_all():
+    _stages.clear()
+
+
+def rss_bytes():
+    """Current resident set size of this process"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # No /proc (e.g. macOS): fall back to peak RSS, reported in bytes there
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def memory_report():
+    """Per-stage pool usage plus process RSS, as a printable string"""
+    lines = [f"{'stage':<12} {'pools':>5} {'bytes':>12} {'in use':>10} {'dropped':>8}"]
+    total = 0
+    for stage, pools in _stages.items():
+        nbytes = sum(p.nbytes for p in pools)
+        in_use = sum(len(p) for p in pools)
+        capacity = sum(getattr(p, "slots", getattr(p, "capacity", 0)) for p in pools)
+        dropped = sum(p.dropped for p in pools)
+        total += nbytes
+        lines.append(f"{stage:<12} {len(pools):>5} {nbytes:>12,} {in_use:>4}/{capacity:<5} {dropped:>8}")
+    lines.append(f"{'pools total':<12} {'':>5} {total:>12,}")
+    lines.append(f"{'process RSS':<12} {'':>5} {rss_bytes():>12,}")
+    return "\n".join(lines)
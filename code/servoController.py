@@ -1,7 +1,7 @@
 # servoController.py
+import json
+import os
 import time
-import board, busio
-from adafruit_pca9685 import PCA9685
 
 # -----------------------
 # Servo setup
@@ -14,14 +14,34 @@ SERVOS = {
     "left_elbow":     {"channel": 3, "min": 100, "max": 500},
 }
 
+LED0_ON_L = 0x06  # first PWM register, 4 bytes per channel
+
+POSES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "poses.json")
+
+# Per-servo angles used by crawling_gait (left/right are mirrored)
+CRAWL_ANGLES = {
+    "right_shoulder": {"backward": 0, "forward": 180},
+    "left_shoulder":  {"backward": 180, "forward": 0},
+    "right_elbow":    {"up": 0, "down": 180},
+    "left_elbow":     {"up": 180, "down": 0},
+}
+
 pca = None  # global PCA9685 handle
+angles = {}  # last angle commanded to each servo
 
 
-def init_servos(address=0x40, freq=50):
-    """Initialize I2C and PCA9685"""
+def init_servos(address=0x40, freq=50, simulate=False):
+    """Initialize I2C and PCA9685 (or the simulated backend if simulate=True)"""
     global pca
-    i2c = busio.I2C(board.SCL, board.SDA)
-    pca = PCA9685(i2c, address=address)
+    angles.clear()
+    if simulate:
+        from servoSim import SimulatedPCA9685
+        pca = SimulatedPCA9685(address=address)
+    else:
+        import board, busio
+        from adafruit_pca9685 import PCA9685
+        i2c = busio.I2C(board.SCL, board.SDA)
+        pca = PCA9685(i2c, address=address)
     pca.frequency = freq
     print("PCA9685 initialized at I2C address", hex(address))
 
@@ -35,14 +55,57 @@ def angle_to_pwm(angle, servo_name):
 
 def set_servo_angle(servo_name, angle):
     """Move a servo to a given angle"""
-    cfg = SERVOS[servo_name]
-    pulse = angle_to_pwm(angle, servo_name)
-    pca.channels[cfg["channel"]].duty_cycle = pulse << 4  # 12-bit value shifted
+    set_servo_angles({servo_name: angle})
+
+
+def set_servo_angles(angle_map):
+    """Move several servos at once, e.g. {"left_elbow": 90, "right_elbow": 90}"""
+    pulses = {SERVOS[name]["channel"]: angle_to_pwm(angle, name)
+              for name, angle in angle_map.items()}
+    write_pulses(pulses)
+    angles.update(angle_map)
+
+
+def write_pulses(pulses):
+    """Write {channel: pulse} with one I2C block write per run of adjacent channels.
+
+    The PCA9685 auto-increments its register pointer (the driver enables it
+    when the frequency is set), so all four arm channels go out in a single
+    transaction instead of one bus round-trip per servo.
+    """
+    run = []
+    for channel in sorted(pulses):
+        if run and channel != run[-1] + 1:
+            _write_run(run, pulses)
+            run = []
+        run.append(channel)
+    if run:
+        _write_run(run, pulses)
+
+
+def _write_run(run, pulses):
+    """Write consecutive channels starting at run[0] (ON=0, OFF=pulse)"""
+    buf = bytearray([LED0_ON_L + 4 * run[0]])
+    for channel in run:
+        pulse = pulses[channel]
+        buf += bytes((0, 0, pulse & 0xFF, (pulse >> 8) & 0x0F))
+    with pca.i2c_device as i2c:
+        i2c.write(buf)
+
+
+def move_servos(angle_map, speed=0.01, steps=10):
+    """Move servos smoothly to their targets in steps+1 batched writes"""
+    start = {name: angles.get(name, 90) for name in angle_map}
+    for i in range(steps + 1):
+        set_servo_angles({name: start[name] + (target - start[name]) * i / steps
+                          for name, target in angle_map.items()})
+        time.sleep(speed)
 
 
 def release_servo(servo_name):
     """Stop sending PWM to one servo (relaxes it)"""
     cfg = SERVOS[servo_name]
+    angles.pop(servo_name, None)
     pca.channels[cfg["channel"]].duty_cycle = 0
 
 
@@ -61,6 +124,54 @@ def cleanup():
 
 
 
+# -----------------------
+# Named poses
+# -----------------------
+
+def load_poses(path=POSES_FILE):
+    """Read the named poses saved by the jog tool ({} if there are none yet)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def clean_pose(pose):
+    """Keep only servos in SERVOS and clamp their angles to 0–180 (ValueError if malformed)"""
+    if not isinstance(pose, dict):
+        raise ValueError(f"pose must be a {{servo_name: angle}} dict, got {type(pose).__name__}")
+    try:
+        return {servo: max(0.0, min(180.0, float(angle)))
+                for servo, angle in pose.items() if servo in SERVOS}
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"bad angle in pose: {e}") from None
+
+
+def get_pose(name, path=POSES_FILE):
+    """Look up a saved pose, cleaned with clean_pose (KeyError if there is no such pose)"""
+    poses = load_poses(path)
+    if not isinstance(poses, dict):
+        raise ValueError(f"{path} does not hold a dict of poses")
+    return clean_pose(poses[name])
+
+
+def save_pose(name, pose_angles, path=POSES_FILE):
+    """Store a {servo_name: angle} dict under a pose name"""
+    poses = load_poses(path)
+    if not isinstance(poses, dict):
+        raise ValueError(f"{path} does not hold a dict of poses")
+    poses[name] = {servo: pose_angles[servo] for servo in SERVOS if servo in pose_angles}
+    with open(path, "w") as f:
+        json.dump(poses, f, indent=2, sort_keys=True)
+
+
+def set_pose(name, path=POSES_FILE):
+    """Move all servos to a saved pose in one batched write"""
+    pose = get_pose(name, path)
+    set_servo_angles(pose)
+    return pose
+
+
 # -----------------------
 # Helpers for symmetry
 # -----------------------
@@ -73,23 +184,19 @@ def mirror_angle(angle):
 def set_shoulders(left_angle, symmetric=True):
     """Move shoulders. If symmetric, mirror right from left"""
     if symmetric:
-        set_servo_angle("left_shoulder", left_angle)
-        set_servo_angle("right_shoulder", mirror_angle(left_angle))
+        l, r = left_angle, mirror_angle(left_angle)
     else:
         l, r = left_angle
-        set_servo_angle("left_shoulder", l)
-        set_servo_angle("right_shoulder", r)
+    set_servo_angles({"left_shoulder": l, "right_shoulder": r})
 
 
 def set_elbows(left_angle, symmetric=True):
     """Move elbows. If symmetric, mirror right from left"""
     if symmetric:
-        set_servo_angle("left_elbow", left_angle)
-        set_servo_angle("right_elbow", mirror_angle(left_angle))
+        l, r = left_angle, mirror_angle(left_angle)
     else:
         l, r = left_angle
-        set_servo_angle("left_elbow", l)
-        set_servo_angle("right_elbow", r)
+    set_servo_angles({"left_elbow": l, "right_elbow": r})
 
 
 
@@ -108,9 +215,15 @@ def test_servos(delay):
             time.sleep(delay)
 
 
-# -----------------------
-# Gait definition
-# -----------------------
+def sweep_servos(cycles=None, delay=0.01):
+    """Sweep all servos 0→180→0 together (forever if cycles is None)"""
+    cycle = 0
+    while cycles is None or cycle < cycles:
+        for angle in list(range(181)) + list(range(180, -1, -1)):
+            set_servo_angles({name: angle for name in SERVOS})
+            time.sleep(delay)
+        cycle += 1
+
 
 # -----------------------
 # Gait definitions
@@ -194,6 +307,27 @@ def turn_right(steps, delay):
     time.sleep(delay)
 
 
+def crawl_cycle(step_delay, speed=0.01, steps=10):
+    """One crawl cycle: lift, swing and plant the right arm, then the left"""
+    for side in ("right", "left"):
+        elbow, shoulder = f"{side}_elbow", f"{side}_shoulder"
+        move_servos({elbow: CRAWL_ANGLES[elbow]["up"]}, speed, steps)
+        time.sleep(step_delay)
+        move_servos({shoulder: CRAWL_ANGLES[shoulder]["forward"]}, speed, steps)
+        time.sleep(step_delay)
+        move_servos({elbow: CRAWL_ANGLES[elbow]["down"]}, speed, steps)
+        time.sleep(step_delay)
+
+
+def crawling_gait(cycles=None, step_delay=0.5):
+    """Crawl one arm at a time (forever if cycles is None)"""
+    cycle = 0
+    while cycles is None or cycle < cycles:
+        print(f"Crawl cycle {cycle+1}")
+        crawl_cycle(step_delay)
+        cycle += 1
+
+
 # -----------------------
 # Main
 # -----------------------
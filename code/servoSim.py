@@ -0,0 +1,64 @@
+# servoSim.py
+# Simulated PCA9685 so the servo code can run without a Pi attached.
+# It speaks the same interface servoController uses on the real driver
+# (channels[n].duty_cycle, i2c_device block writes, frequency, deinit) and
+# logs every duty write as (time.monotonic(), channel, duty_cycle).
+import time
+
+LED0_ON_L = 0x06
+NUM_CHANNELS = 16
+
+
+class _SimChannel:
+    def __init__(self, sim, index):
+        self._sim = sim
+        self._index = index
+
+    @property
+    def duty_cycle(self):
+        return self._sim.duty[self._index]
+
+    @duty_cycle.setter
+    def duty_cycle(self, value):
+        self._sim.transactions += 1
+        self._sim._record(self._index, value)
+
+
+class _SimI2CDevice:
+    def __init__(self, sim):
+        self._sim = sim
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def write(self, buf):
+        """Decode an auto-increment write starting at a LEDn_ON_L register"""
+        self._sim.transactions += 1
+        reg, data = buf[0], buf[1:]
+        if reg < LED0_ON_L or (reg - LED0_ON_L) % 4 or len(data) % 4:
+            raise ValueError(f"unsupported register write at {hex(reg)}")
+        first = (reg - LED0_ON_L) // 4
+        for i in range(len(data) // 4):
+            off = data[4 * i + 2] | (data[4 * i + 3] << 8)
+            self._sim._record(first + i, off << 4)  # same units as duty_cycle
+
+
+class SimulatedPCA9685:
+    def __init__(self, address=0x40):
+        self.address = address
+        self.frequency = 50
+        self.duty = [0] * NUM_CHANNELS
+        self.writes = []       # (timestamp, channel, duty_cycle)
+        self.transactions = 0  # simulated I2C transactions
+        self.channels = [_SimChannel(self, i) for i in range(NUM_CHANNELS)]
+        self.i2c_device = _SimI2CDevice(self)
+
+    def _record(self, channel, value):
+        self.duty[channel] = value
+        self.writes.append((time.monotonic(), channel, value))
+
+    def deinit(self):
+        pass
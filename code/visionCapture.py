@@ -0,0 +1,60 @@
+# visionCapture.py
+# Camera setup and frame grabbing for the vision pipeline, sized for the
+# Pi Zero W. Instead of full-resolution RGB stills, frames can come from a
+# YUV420 stream with only the luma (Y) plane kept, optionally from the small
+# "lores" stream, and are copied straight into a preallocated FramePool.
+from framePool import FramePool
+
+# Capture formats:
+#   "still"  - full-resolution RGB still (the original cameraTest behaviour)
+#   "yuv420" - main stream in YUV420, luma only
+#   "lores"  - downscaled lores stream in YUV420, luma only
+CAPTURE_FORMATS = ("still", "yuv420", "lores")
+
+MAIN_SIZE = (640, 480)
+LORES_SIZE = (320, 240)
+BUFFER_COUNT = 2  # camera buffers; each extra one is a full main+lores frame
+
+
+def configure_camera(picam2, fmt="lores", main_size=MAIN_SIZE, lores_size=LORES_SIZE,
+                     buffer_count=BUFFER_COUNT, transform=None):
+    """Configure a Picamera2 for one of CAPTURE_FORMATS. Returns the stream name to read."""
+    kwargs = {} if transform is None else {"transform": transform}
+    if fmt == "still":
+        config = picam2.create_still_configuration(**kwargs)
+        stream = "main"
+    elif fmt == "yuv420":
+        config = picam2.create_video_configuration(
+            main={"size": main_size, "format": "YUV420"}, buffer_count=buffer_count, **kwargs)
+        stream = "main"
+    elif fmt == "lores":
+        config = picam2.create_video_configuration(
+            main={"size": main_size, "format": "YUV420"},
+            lores={"size": lores_size, "format": "YUV420"},
+            buffer_count=buffer_count, **kwargs)
+        stream = "lores"
+    else:
+        raise ValueError(f"unknown capture format {fmt!r}, expected one of {CAPTURE_FORMATS}")
+    picam2.configure(config)
+    return stream
+
+
+def make_luma_pool(picam2, stream, slots=4):
+    """FramePool sized for the Y plane of a configured YUV420 stream"""
+    width, height = picam2.camera_configuration()[stream]["size"]
+    return FramePool(width, height, channels=1, slots=slots)
+
+
+def capture_luma(picam2, stream, pool):
+    """
+    Capture one frame and copy its luma plane into pool. Returns the slot.
+
+    The camera buffer is read in place through MappedArray and handed back
+    to the camera straight away, so nothing but the pool holds frame data.
+    """
+    from picamera2 import MappedArray
+
+    stride = picam2.camera_configuration()[stream]["stride"]
+    with picam2.captured_request() as request:
+        with MappedArray(request, stream) as m:
+            return pool.put(m.array, stride=stride)
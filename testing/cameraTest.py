@@ -1,12 +1,23 @@
+import os
+import sys
 from picamera2 import Picamera2
 from libcamera import Transform
 from time import sleep
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "code"))
+import framePool
+import visionCapture
+
 # --- Configuration ---
 OUTPUT_DIR = "../visionOutput"
-OUTPUT_FILENAME = f"{OUTPUT_DIR}/capture.jpg"
 WARMUP_TIME = 2        # Seconds to wait for the camera to adjust
 
+# "still" saves a full-resolution JPEG. "yuv420" and "lores" keep only the
+# luma plane (of the main or the downscaled lores stream) in a preallocated
+# frame pool and save it as a greyscale PGM - far less memory on the Pi Zero.
+CAPTURE_FORMAT = "still"
+OUTPUT_FILENAME = f"{OUTPUT_DIR}/capture.jpg" if CAPTURE_FORMAT == "still" else f"{OUTPUT_DIR}/capture.pgm"
+
 # --- Script ---
 try:
     print("Starting Picamera2...")
@@ -14,20 +25,17 @@ try:
     # 1. Create the Picamera2 instance
     picam2 = Picamera2()
 
-    # 2. Configure for still images
-    # *****************************************************************
-    # MODIFICATION HERE: Use the 'transform' argument in create_still_configuration
-    # We use 'Transform(vflip=True, hflip=True)' which results in 180 degrees rotation.
-    # Alternatively, for explicit rotation, we could use the libcamera.Transform class.
-    # We must import 'Transform' from 'libcamera'.
-    
-    # Transformation: 180 degrees is equivalent to a vertical flip (vflip) AND a 
-    # horizontal flip (hflip).
-    config = picam2.create_still_configuration(transform=Transform(vflip=True, hflip=True))
-    # *****************************************************************
+    # 2. Configure the camera for CAPTURE_FORMAT and apply it
+    # visionCapture.configure_camera picks the configuration:
+    #   "still"           -> create_still_configuration (full-resolution RGB)
+    #   "yuv420"/"lores"  -> create_video_configuration with YUV420 streams,
+    #                        returning the stream to read the luma plane from
+    # Every format gets Transform(vflip=True, hflip=True) from libcamera: a
+    # vertical plus a horizontal flip, i.e. a 180 degree rotation.
+    stream = visionCapture.configure_camera(
+        picam2, CAPTURE_FORMAT, transform=Transform(vflip=True, hflip=True))
 
-    # Apply the configuration and start the camera
-    picam2.configure(config)
+    # Start the camera
     picam2.start()
 
     print(f"Camera started. Waiting {WARMUP_TIME} seconds for sensor warm-up...")
@@ -37,7 +45,15 @@ try:
     print(f"Capturing image and saving to {OUTPUT_FILENAME} with 180 degree rotation...")
     
     # Capture the image
-    picam2.capture_file(OUTPUT_FILENAME)
+    if CAPTURE_FORMAT == "still":
+        picam2.capture_file(OUTPUT_FILENAME)
+    else:
+        pool = framePool.register("capture", visionCapture.make_luma_pool(picam2, stream, slots=1))
+        luma = visionCapture.capture_luma(picam2, stream, pool)
+        with open(OUTPUT_FILENAME, "wb") as f:
+            f.write(f"P5 {pool.width} {pool.height} 255\n".encode())
+            f.write(luma)
+        print(framePool.memory_report())
 
     print(f"Successfully captured and saved {OUTPUT_FILENAME}.")
 
@@ -0,0 +1,317 @@
+# This script runs the servo sweep, gaits, poses and jog console headless
+# against the simulated PCA9685 and checks the exact timed sequence of duty
+# writes they produce. Sleeps run on a virtual clock (see virtualClock.py),
+# so minutes of robot motion are checked in well under a second and no Pi
+# or servos are needed. It also checks the frame and telemetry pools.
+
+# --- Usage ---
+# python3 headlessTest.py       # run every check, exit status 1 on failure
+# python3 headlessTest.py -v    # also list each passing check
+
+# --- Import Libraries ---
+import os
+import select
+import sys
+import tempfile
+import time
+import traceback
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "code"))
+from virtualClock import (VirtualClock, assert_writes, duty, expected_move,
+                          run_headless, sc)
+import framePool
+import memorySoak
+
+NAMES = sorted(sc.SERVOS, key=lambda n: sc.SERVOS[n]["channel"])
+
+
+# --- Checks ---
+
+def check_sweep(cycles, delay):
+    """Every step writes all four channels at once, delay apart"""
+    writes, clock = run_headless(sc.sweep_servos, cycles=cycles, delay=delay)
+    expected, t = [], 0.0
+    for _ in range(cycles):
+        for angle in list(range(181)) + list(range(180, -1, -1)):
+            expected += [(t, sc.SERVOS[n]["channel"], duty(n, angle)) for n in NAMES]
+            t += delay
+    assert_writes(writes, expected)
+    assert sc.pca.transactions == cycles * 362
+    assert abs(clock.now - t) < 1e-6
+
+
+def check_crawl(cycles, step_delay):
+    """crawling_gait moves one servo at a time, smoothly, with pauses between"""
+    writes, clock = run_headless(sc.crawling_gait, cycles=cycles, step_delay=step_delay)
+    expected, t = [], 0.0
+    current = {n: 90 for n in NAMES}
+    for _ in range(cycles):
+        for side in ("right", "left"):
+            elbow, shoulder = f"{side}_elbow", f"{side}_shoulder"
+            for name, target in ((elbow, sc.CRAWL_ANGLES[elbow]["up"]),
+                                 (shoulder, sc.CRAWL_ANGLES[shoulder]["forward"]),
+                                 (elbow, sc.CRAWL_ANGLES[elbow]["down"])):
+                move, t = expected_move(t, current, {name: target})
+                expected += move
+                current[name] = target
+                t += step_delay
+    assert_writes(writes, expected)
+    assert abs(clock.now - t) < 1e-6
+
+
+def check_long_crawl():
+    """A six-minute crawl finishes in well under a second of wall time"""
+    start = time.perf_counter()
+    writes, clock = run_headless(sc.crawling_gait, cycles=100, step_delay=0.5)
+    elapsed = time.perf_counter() - start
+    assert abs(clock.now - 100 * 6 * (11 * 0.01 + 0.5)) < 1e-6
+    assert len(writes) == 100 * 6 * 11
+    assert elapsed < 1.0, f"took {elapsed:.2f}s of wall time"
+
+
+def expected_phases(phases, delay):
+    """
+    Writes for a gait made of phases separated by sleep(delay). Each phase is
+    a list of {servo: angle} maps, one per set_servo_angles call.
+    """
+    expected, t = [], 0.0
+    for phase in phases:
+        for angle_map in phase:
+            for name in sorted(angle_map, key=lambda n: sc.SERVOS[n]["channel"]):
+                expected.append((t, sc.SERVOS[name]["channel"], duty(name, angle_map[name])))
+        t += delay
+    return expected, t
+
+
+SHOULDERS_FORWARD = {"left_shoulder": 40, "right_shoulder": 140}
+SHOULDERS_BACK = {"left_shoulder": 140, "right_shoulder": 40}
+ELBOWS_UP = {"left_elbow": 90, "right_elbow": 90}
+ELBOWS_DOWN = {"left_elbow": 20, "right_elbow": 160}
+
+STROKE_PHASES = [
+    [SHOULDERS_FORWARD, ELBOWS_UP],
+    [ELBOWS_DOWN],
+    [SHOULDERS_BACK],
+    [ELBOWS_UP],
+]
+TURN_LEFT_PHASES = [
+    [SHOULDERS_FORWARD, ELBOWS_UP],
+    [ELBOWS_DOWN],
+    [{"right_shoulder": 40}],
+    [ELBOWS_UP],
+]
+TURN_RIGHT_PHASES = [
+    [SHOULDERS_FORWARD, ELBOWS_UP],
+    [ELBOWS_DOWN],
+    [{"left_shoulder": 140}],
+    [ELBOWS_UP],
+]
+RESET_PHASES = [[SHOULDERS_FORWARD, ELBOWS_UP]]
+
+
+def check_gait(func, steps, delay, phases):
+    """Stroke/turn gaits write exactly these angles, channels and times"""
+    writes, clock = run_headless(func, steps=steps, delay=delay)
+    expected, t = expected_phases(phases, delay)
+    assert_writes(writes, expected)
+    assert abs(clock.now - t) < 1e-6
+
+
+def check_walk_forward_pose(steps):
+    """walk_forward ends each stroke with shoulders back and elbows up"""
+    run_headless(sc.walk_forward, steps=steps, delay=0.8)
+    assert sc.angles == {"left_shoulder": 140, "right_shoulder": 40,
+                         "left_elbow": 90, "right_elbow": 90}
+    assert sc.pca.duty[1] == duty("left_shoulder", 140)
+
+
+def check_symmetric_writes_batched():
+    """set_shoulders/set_elbows put both sides on the bus in one transaction"""
+    def body():
+        sc.set_shoulders(40)
+        sc.set_elbows((20, 160), symmetric=False)
+    writes, _ = run_headless(body)
+    assert sc.pca.transactions == 2
+    assert [(c, d) for _, c, d in writes] == [
+        (0, duty("right_shoulder", 140)), (1, duty("left_shoulder", 40)),
+        (2, duty("right_elbow", 160)), (3, duty("left_elbow", 20))]
+
+
+def check_pose_round_trip():
+    """A pose saved by the jog console is replayed exactly by set_pose"""
+    pose = {"right_shoulder": 30, "left_shoulder": 150, "right_elbow": 45, "left_elbow": 135}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "poses.json")
+        sc.save_pose("crouch", pose, path)
+        writes, _ = run_headless(sc.set_pose, "crouch", path)
+    assert sc.pca.transactions == 1
+    assert [(c, d) for _, c, d in writes] == [(sc.SERVOS[n]["channel"], duty(n, pose[n])) for n in NAMES]
+
+
+def check_release():
+    """release_all_servos zeroes every channel"""
+    def body():
+        sc.set_servo_angles({n: 90 for n in NAMES})
+        sc.release_all_servos()
+    run_headless(body)
+    assert sc.pca.duty[:4] == [0, 0, 0, 0]
+    assert sc.angles == {}
+
+
+def run_jog(keys=b"", events=(), **kwargs):
+    """
+    Run the jog console headless with a pipe standing in for the keyboard.
+
+    keys are written up front; events are (virtual time, bytes) keystrokes
+    written when the clock reaches that time. Returns (writes, clock).
+    """
+    import servoTest2 as jog
+    r, w = os.pipe()
+    try:
+        if keys:
+            os.write(w, keys)
+        return run_headless(lambda: jog.jog(r, **kwargs),
+                            events=[(t, lambda data=data: os.write(w, data)) for t, data in events])
+    finally:
+        os.close(r)
+        os.close(w)
+
+
+def check_jog_keys():
+    """The jog console turns a burst of keys into one batched write"""
+    run_jog(b"qqwwee\x1b")
+    assert sc.pca.transactions == 2  # initial pose, then the burst
+    assert sc.angles["right_shoulder"] == 94 and sc.angles["left_shoulder"] == 94
+    assert sc.angles["right_elbow"] == 94 and sc.angles["left_elbow"] == 90
+
+
+def check_jog_ticks():
+    """The jog loop runs its control ticks on the virtual clock"""
+    import servoTest2 as jog
+    _, clock = run_jog(max_ticks=50)
+    assert abs(clock.now - 50 / jog.CONTROL_HZ) < 1e-6
+    assert sc.pca.transactions == 1  # just the initial pose, no input arrived
+
+
+def check_jog_latency(t_key):
+    """
+    A keystroke arriving mid-tick is written the moment it arrives: the loop
+    wakes on the key fd, not on the next 10 ms tick.
+    """
+    writes, _ = run_jog(events=[(t_key, b"e")], max_ticks=10)
+    moved = [t for t, channel, d in writes
+             if channel == sc.SERVOS["right_elbow"]["channel"] and d == duty("right_elbow", 92)]
+    assert len(moved) == 1, f"expected one write of the jogged elbow, got {moved}"
+    latency = moved[0] - t_key
+    assert latency == 0, f"keystroke at {t_key}s was written {latency * 1000:.2f} ms later"
+
+
+def check_virtual_clock_restores():
+    """The real clocks come back after the harness exits"""
+    real_sleep, real_select = time.sleep, select.select
+    with VirtualClock():
+        assert time.sleep is not real_sleep and select.select is not real_select
+    assert time.sleep is real_sleep and select.select is real_select
+
+
+def check_luma_pool():
+    """FramePool keeps only the Y rows of a padded buffer and drops the oldest when full"""
+    pool = framePool.FramePool(4, 2, slots=2)
+    stride = 6
+    for n in range(3):
+        buf = bytearray(stride * 3)  # 2 luma rows + 1 chroma row
+        buf[0:4] = bytes([n] * 4)
+        buf[stride:stride + 4] = bytes([n + 10] * 4)
+        pool.put(buf, stride=stride)
+    assert pool.nbytes == 16 and len(pool) == 2 and pool.dropped == 1
+    assert bytes(pool.get()) == bytes([1] * 4 + [11] * 4)
+    assert bytes(pool.latest()) == bytes([2] * 4 + [12] * 4)
+    try:
+        pool.put(b"short")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("short frame accepted")
+
+
+def check_telemetry_ring():
+    """TelemetryLog keeps the newest `capacity` records in a fixed array"""
+    log = framePool.TelemetryLog(("t", "v"), 3)
+    nbytes = log.nbytes
+    for i in range(5):
+        log.append(i, i * 2)
+    assert list(log.records()) == [(2.0, 4.0), (3.0, 6.0), (4.0, 8.0)]
+    assert log.last() == (4.0, 8.0) and log.dropped == 2 and log.nbytes == nbytes == 48
+
+
+def check_soak_flat():
+    """A short synthetic soak keeps RSS within the benchmark's limit"""
+    try:
+        baseline, peak, _, n, dropped = memorySoak.soak(frames=3000, quiet=True)
+        assert n == 3000
+        assert dropped > 0, "slow vision stage never made the frame pool drop"
+        assert peak - baseline <= memorySoak.MAX_GROWTH, f"RSS grew {peak - baseline:,} B"
+        report = framePool.memory_report()
+        assert "capture" in report and "telemetry" in report
+    finally:
+        framePool.unregister_all()
+
+
+# --- Runner ---
+
+def build_checks():
+    checks = [
+        ("sweep cycles=1 delay=0.01", check_sweep, (1, 0.01)),
+        ("sweep cycles=2 delay=0.05", check_sweep, (2, 0.05)),
+        ("crawl cycles=1 step_delay=0.5", check_crawl, (1, 0.5)),
+        ("crawl cycles=3 step_delay=0.0", check_crawl, (3, 0.0)),
+        ("crawl cycles=3 step_delay=0.25", check_crawl, (3, 0.25)),
+    ]
+    for steps, delay in ((1, 0.8), (3, 0.5)):
+        checks += [
+            (f"walk_forward steps={steps} delay={delay}",
+             check_gait, (sc.walk_forward, steps, delay, STROKE_PHASES * steps)),
+            (f"turn_left steps={steps} delay={delay}",
+             check_gait, (sc.turn_left, steps, delay, TURN_LEFT_PHASES * steps + RESET_PHASES)),
+            (f"turn_right steps={steps} delay={delay}",
+             check_gait, (sc.turn_right, steps, delay, TURN_RIGHT_PHASES * steps + RESET_PHASES)),
+        ]
+    checks.append(("walk_forward pose steps=2", check_walk_forward_pose, (2,)))
+    for t_key in (0.0, 0.0137, 0.0499):
+        checks.append((f"jog latency key at {t_key}s", check_jog_latency, (t_key,)))
+    checks += [
+        ("long crawl", check_long_crawl, ()),
+        ("symmetric writes batched", check_symmetric_writes_batched, ()),
+        ("pose round trip", check_pose_round_trip, ()),
+        ("release", check_release, ()),
+        ("jog keys", check_jog_keys, ()),
+        ("jog ticks", check_jog_ticks, ()),
+        ("virtual clock restores", check_virtual_clock_restores, ()),
+        ("luma pool", check_luma_pool, ()),
+        ("telemetry ring", check_telemetry_ring, ()),
+        ("soak flat", check_soak_flat, ()),
+    ]
+    return checks
+
+
+def main():
+    verbose = "-v" in sys.argv[1:]
+    checks = build_checks()
+    failed = 0
+    start = time.perf_counter()
+    for name, func, args in checks:
+        try:
+            func(*args)
+            if verbose:
+                print(f"ok    {name}")
+        except Exception:
+            failed += 1
+            print(f"FAIL  {name}")
+            traceback.print_exc()
+    elapsed = time.perf_counter() - start
+    print(f"\n{len(checks) - failed}/{len(checks)} checks passed in {elapsed:.2f}s")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
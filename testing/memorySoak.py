@@ -0,0 +1,126 @@
+# This script is a memory soak benchmark for the capture -> vision ->
+# telemetry pipeline. It feeds synthetic padded YUV420 frames (as the
+# camera's lores stream would deliver them) through the fixed-budget frame
+# pools and telemetry logs in framePool.py and samples the process RSS,
+# failing if resident memory keeps growing once the pipeline is warm.
+# No camera is needed.
+
+# --- Usage ---
+# python3 memorySoak.py                     # 60 s soak
+# python3 memorySoak.py --duration 10800    # three hour soak
+# python3 memorySoak.py --frames 5000       # fixed number of frames
+
+# --- Import Libraries ---
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "code"))
+import framePool
+
+# --- Configuration ---
+WIDTH, HEIGHT = 320, 240  # lores stream size
+STRIDE = 384              # padded row length of the camera buffer
+FRAME_SLOTS = 4
+TELEMETRY_RECORDS = 3600  # one hour of 1 Hz records
+WARMUP_FRAMES = 200       # frames before the RSS baseline is taken
+MAX_GROWTH = 1 << 20      # allowed RSS growth after warm-up (bytes)
+
+# The vision stage is slower than capture: it wakes every VISION_EVERY frames
+# and works through at most VISION_BURST of them, so the frame pool fills up
+# and the oldest frames get overwritten (and counted as dropped).
+VISION_EVERY = 8
+VISION_BURST = 3
+
+
+def synthetic_frame(n):
+    """A fresh padded YUV420 buffer each call, like the camera hands out"""
+    buf = bytearray(STRIDE * HEIGHT * 3 // 2)
+    row = (n * 7) % HEIGHT
+    buf[row * STRIDE:row * STRIDE + WIDTH] = bytes([n & 0xFF]) * WIDTH  # a moving bright bar
+    return buf
+
+
+def soak(frames=None, duration=None, report_every=0, quiet=False):
+    """
+    Run the pipeline for `frames` frames or `duration` seconds.
+
+    Returns (baseline RSS, peak RSS, last RSS, frames run, frames dropped),
+    RSS taken after warm-up and sampled every 100 frames.
+    """
+    framePool.unregister_all()
+    capture = framePool.register("capture", framePool.FramePool(WIDTH, HEIGHT, slots=FRAME_SLOTS))
+    vision = framePool.register("vision", framePool.TelemetryLog(("frame", "mean", "row"), TELEMETRY_RECORDS))
+    telemetry = framePool.register("telemetry", framePool.TelemetryLog(("t", "fps", "rss"), TELEMETRY_RECORDS))
+
+    start = time.monotonic()
+    last_log = start
+    next_report = start + report_every
+    baseline = peak = rss = None
+    n = 0
+    while (frames is None or n < frames) and (duration is None or time.monotonic() - start < duration):
+        # capture: keep only the luma plane of the padded buffer
+        capture.put(synthetic_frame(n), stride=STRIDE)
+
+        # vision: now and then, work through a few of the oldest frames and
+        # find the brightest sampled row of each
+        if n % VISION_EVERY == VISION_EVERY - 1:
+            for _ in range(VISION_BURST):
+                luma = capture.get()
+                if luma is None:
+                    break
+                sums = [sum(luma[r * WIDTH:(r + 1) * WIDTH:16]) for r in range(0, HEIGHT, 8)]
+                best = max(range(len(sums)), key=sums.__getitem__)
+                vision.append(n, sum(sums) / (len(sums) * WIDTH / 16), best * 8)
+
+        n += 1
+        if n % 100 == 0:
+            rss = framePool.rss_bytes()
+            if n >= WARMUP_FRAMES:
+                baseline = rss if baseline is None else baseline
+                peak = max(peak or rss, rss)
+        now = time.monotonic()
+        if now - last_log >= 1.0:
+            telemetry.append(now - start, n / (now - start), framePool.rss_bytes())
+            last_log = now
+        if report_every and now >= next_report:
+            next_report += report_every
+            if not quiet:
+                print(framePool.memory_report(), "\n")
+
+    if baseline is None:
+        baseline = peak = rss = framePool.rss_bytes()
+    return baseline, peak, rss, n, capture.dropped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory soak benchmark with synthetic frames")
+    parser.add_argument("--duration", type=float, default=None, help="seconds to run (default 60)")
+    parser.add_argument("--frames", type=int, default=None, help="number of frames to run")
+    parser.add_argument("--report-every", type=int, default=60, help="print the memory report every N seconds")
+    args = parser.parse_args()
+    if args.duration is None and args.frames is None:
+        args.duration = 60
+
+    print("Starting memory soak. Press Ctrl+C to stop early.")
+    start = time.monotonic()
+    try:
+        baseline, peak, last, n, dropped = soak(args.frames, args.duration, args.report_every)
+    except KeyboardInterrupt:
+        print("\nStopped.")
+        return
+    elapsed = time.monotonic() - start
+
+    print(framePool.memory_report())
+    growth = peak - baseline
+    print(f"\n{n} frames in {elapsed:.1f}s ({n / elapsed:.0f} fps), {dropped} dropped by the slow vision stage")
+    print(f"RSS after warm-up {baseline:,} B, peak {peak:,} B, last {last:,} B, growth {growth:,} B")
+    if growth > MAX_GROWTH:
+        print(f"FAIL: RSS grew by more than {MAX_GROWTH:,} B")
+        sys.exit(1)
+    print("PASS: resident memory stayed flat.")
+
+
+if __name__ == "__main__":
+    main()
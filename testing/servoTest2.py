@@ -1,156 +1,342 @@
-# This script provides an interactive way to test individual servos connected
-# to a PCA9685 driver board. It allows you to select a servo channel and
-# set a specific angle for that servo.
+# This script is a live jog console for the four arm servos. Keys (or a
+# gamepad, if one is plugged in) nudge servos by small steps and the new
+# angles are streamed to the PCA9685 in one batched write per control tick,
+# so several servos can be moved at once while you watch the robot.
+# Poses found this way can be saved by name and reused by the gaits
+# through servoController.set_pose().
 
 # --- Required Library Installation ---
 # Ensure you have the necessary libraries installed:
 # sudo pip3 install adafruit-circuitpython-pca9685
-# sudo pip3 install adafruit-circuitpython-motor
 # sudo pip3 install adafruit-blinka
+# Optional, for gamepad jogging:
+# sudo pip3 install evdev
+
+# --- Usage ---
+# python3 servoTest2.py                       # keyboard, real hardware
+# python3 servoTest2.py --sim                 # keyboard, simulated PCA9685
+# python3 servoTest2.py --gamepad /dev/input/event0
 
 # --- Import Libraries ---
-import board
-import busio
-from adafruit_pca9685 import PCA9685
-from adafruit_motor import servo
+import argparse
+import os
+import re
+import select
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "code"))
+import servoController as sc
 
 # --- Configuration ---
-# Define a list of dictionaries, where each dictionary represents a servo
-# You can now give each servo a name and specify its own min/max angle and pulse width
-SERVO_CONFIG = [
-    {
-        "name": "Right Shoulder",
-        "channel": 0,
-        "min_pulse": 500,
-        "max_pulse": 2500,
-        "min_angle": 0,
-        "max_angle": 180
-    },
-    {
-        "name": "Left Shoulder",
-        "channel": 1,
-        "min_pulse": 500,
-        "max_pulse": 2500,
-        "min_angle": 0,
-        "max_angle": 180
-    },
-    {
-        "name": "Right Elbow",
-        "channel": 2,
-        "min_pulse": 500,
-        "max_pulse": 2500,
-        "min_angle": 0,
-        "max_angle": 180
-    },
-    {
-        "name": "Left Elbow",
-        "channel": 3,
-        "min_pulse": 500,
-        "max_pulse": 2500,
-        "min_angle": 0,
-        "max_angle": 180
-    },
-]
-
-# --- I2C Bus and PCA9685 Setup ---
-try:
-    # Initialize the I2C bus on the Raspberry Pi
-    i2c_bus = busio.I2C(board.SCL, board.SDA)
-    print("I2C bus initialized successfully.")
-
-    # Create a PCA9685 object
-    pca = PCA9685(i2c_bus)
-    
-    # Set the PWM frequency for the servos (usually 50 Hz)
-    pca.frequency = 50
-    print(f"PCA9685 frequency set to {pca.frequency} Hz.")
-
-except ValueError:
-    print("Error: Could not initialize I2C bus. Is the PCA9685 connected and enabled?")
-    print("Ensure I2C is enabled on your Raspberry Pi via 'sudo raspi-config'.")
-    exit()
-except Exception as e:
-    print(f"An unexpected error occurred during setup: {e}")
-    exit()
-
-# --- Servo Initialization ---
-# Create servo objects for each channel based on the configuration list
-servos = {}
-for config in SERVO_CONFIG:
+# Control loop rate. A tick is 10 ms, half of one 20 ms PWM frame at 50 Hz,
+# and a keystroke wakes the loop immediately instead of waiting for the tick.
+CONTROL_HZ = 100
+
+# key: (servo name, direction)
+KEYMAP = {
+    "q": ("right_shoulder", +1), "a": ("right_shoulder", -1),
+    "w": ("left_shoulder", +1),  "s": ("left_shoulder", -1),
+    "e": ("right_elbow", +1),    "d": ("right_elbow", -1),
+    "r": ("left_elbow", +1),     "f": ("left_elbow", -1),
+}
+
+# Step sizes in degrees, cycled with '[' and ']'
+STEP_SIZES = (1, 2, 5, 10)
+
+# Gamepad axis: servo name. Full deflection moves GAMEPAD_SPEED degrees/second.
+GAMEPAD_AXES = {
+    "ABS_X": "left_shoulder",
+    "ABS_Y": "left_elbow",
+    "ABS_RX": "right_shoulder",
+    "ABS_RY": "right_elbow",
+}
+GAMEPAD_SPEED = 120
+GAMEPAD_DEADZONE = 0.1
+
+# Terminal escape sequences (arrow keys, F-keys, ...). Dropped so that only a
+# lone Esc quits the console.
+ESCAPE_SEQUENCE = re.compile(r"\x1b(\[[0-9;?]*[ -/]*[@-~]|O.)")
+
+HELP = """
+Keys:
+  q/a w/s e/d r/f   jog right shoulder, left shoulder, right elbow, left elbow
+  [ ]               smaller / larger step
+  c                 centre all servos (90)
+  p                 save pose (type a name, then Enter)
+  l                 load pose (type a name, then Enter)
+  x                 release all servos
+  Esc or Ctrl+C     quit
+"""
+
+
+# --- Input ---
+
+def open_gamepad(path):
+    """Open an evdev gamepad, or return None if evdev/the device is unavailable"""
     try:
-        # Create a servo object for the specified channel and pulse width range
-        my_servo = servo.Servo(
-            pca.channels[config["channel"]],
-            min_pulse=config["min_pulse"],
-            max_pulse=config["max_pulse"]
-        )
-        servos[config["name"]] = {
-            "object": my_servo,
-            "min_angle": config["min_angle"],
-            "max_angle": config["max_angle"]
-        }
-        print(f"Servo '{config['name']}' on channel {config['channel']} initialized.")
-    except Exception as e:
-        print(f"Error initializing servo '{config['name']}' on channel {config['channel']}: {e}")
-        servos[config["name"]] = None
-
-# --- Interactive Control Loop ---
-def interactive_control():
+        from evdev import InputDevice, ecodes
+    except ImportError:
+        print("evdev is not installed, gamepad disabled.")
+        return None
+    try:
+        dev = InputDevice(path)
+    except OSError as e:
+        print(f"Could not open gamepad {path}: {e}")
+        return None
+    # Remember each axis range so readings can be normalised to -1..1
+    dev.ecodes = ecodes
+    dev.axis_ranges = {}
+    for name in GAMEPAD_AXES:
+        code = ecodes.ecodes[name]
+        try:
+            info = dev.absinfo(code)
+        except OSError:
+            continue
+        dev.axis_ranges[(ecodes.EV_ABS, code)] = (name, info.min, info.max)
+    dev.axis_values = {name: 0.0 for name in GAMEPAD_AXES}
+    print(f"Gamepad '{dev.name}' opened.")
+    return dev
+
+
+def read_gamepad(dev):
     """
-    An interactive function to control a single servo at a time.
+    Drain pending gamepad events without blocking and update dev.axis_values.
+    Returns False if the gamepad has gone away (e.g. unplugged).
     """
-    print("\nAvailable servos:")
-    for name in servos.keys():
-        print(f" - {name}")
-    
-    print("\nStarting interactive servo control. Press Ctrl+C to exit.")
-    
-    while True:
-        try:
-            # Get user input for servo name
-            name_input = input("\nEnter servo name (e.g., 'Right Shoulder') or 'q' to quit: ")
-            if name_input.lower() == 'q':
-                break
-            
-            # Check if the entered servo name is valid
-            if name_input not in servos:
-                print("Error: Invalid servo name. Please choose from the list above.")
+    try:
+        for event in dev.read():
+            # SYN/MSC/KEY events reuse the axis code numbers, only EV_ABS are sticks
+            if event.type != dev.ecodes.EV_ABS:
                 continue
+            key = (event.type, event.code)
+            if key in dev.axis_ranges:
+                name, lo, hi = dev.axis_ranges[key]
+                value = 2.0 * (event.value - lo) / (hi - lo) - 1.0
+                dev.axis_values[name] = 0.0 if abs(value) < GAMEPAD_DEADZONE else value
+    except BlockingIOError:
+        pass
+    except OSError as e:
+        print(f"\r\nGamepad lost ({e}), keyboard jogging only.\r")
+        return False
+    return True
+
+
+def read_keys(fd):
+    """
+    Return whatever keystrokes are waiting on fd, without blocking.
+
+    Escape sequences such as arrow keys are dropped. Returns None once fd
+    reaches end of file (closed pipe, stdin redirected from a file).
+    """
+    chunks = []
+    while select.select([fd], [], [], 0)[0]:
+        data = os.read(fd, 64)
+        if not data:
+            if not chunks:
+                return None
+            break
+        chunks.append(data.decode(errors="ignore"))
+    return ESCAPE_SEQUENCE.sub("", "".join(chunks))
+
+
+# --- Jog state ---
+
+def clamp(angle):
+    return max(0, min(180, angle))
+
+
+def new_state():
+    return {
+        "angles": {name: 90 for name in sc.SERVOS},
+        "step": 1,          # index into STEP_SIZES
+        "prompt": None,     # "save" / "load" while typing a pose name
+        "buffer": "",
+        "quit": False,
+    }
 
-            # Check if the selected servo was initialized successfully
-            servo_data = servos[name_input]
-            if servo_data is None:
-                print(f"Error: Servo '{name_input}' is not available. Please check your connections.")
-                continue
 
-            min_angle = servo_data["min_angle"]
-            max_angle = servo_data["max_angle"]
+def handle_key(state, key, poses_file=sc.POSES_FILE):
+    """Apply one keystroke to the jog state. Returns the servos it moved."""
+    angles = state["angles"]
 
-            # Get user input for the angle
-            angle_input = input(f"Enter desired angle for '{name_input}' ({min_angle}-{max_angle}): ")
-            
-            # Validate the angle input
+    if state["prompt"]:
+        if key in ("\r", "\n"):
+            name, action = state["buffer"].strip(), state["prompt"]
+            state["prompt"], state["buffer"] = None, ""
+            if not name:
+                return set()
+            if action == "save":
+                try:
+                    sc.save_pose(name, angles, poses_file)
+                except (ValueError, OSError) as e:  # JSONDecodeError is a ValueError
+                    print(f"\r\nCould not save pose '{name}' to {poses_file}: {e}\r")
+                    return set()
+                print(f"\r\nPose '{name}' saved.\r")
+                return set()
             try:
-                angle = int(angle_input)
-                if not min_angle <= angle <= max_angle:
-                    print(f"Error: Invalid angle. Please enter a number between {min_angle} and {max_angle}.")
-                    continue
-            except ValueError:
-                print("Error: Invalid input. Please enter a number.")
-                continue
+                pose = sc.get_pose(name, poses_file)
+            except KeyError:
+                print(f"\r\nNo pose named '{name}'.\r")
+                return set()
+            except (ValueError, OSError) as e:
+                print(f"\r\nCould not load pose '{name}' from {poses_file}: {e}\r")
+                return set()
+            angles.update(pose)
+            print(f"\r\nPose '{name}' loaded.\r")
+            return set(pose)
+        if key == "\x1b":
+            state["prompt"], state["buffer"] = None, ""
+            print()
+            return set()
+        if key in ("\x7f", "\b"):
+            state["buffer"] = state["buffer"][:-1]
+        elif key.isprintable():
+            state["buffer"] += key
+        print_prompt(state)
+        return set()
+
+    if key in KEYMAP:
+        name, direction = KEYMAP[key]
+        angle = clamp(angles[name] + direction * STEP_SIZES[state["step"]])
+        if angle == angles[name]:
+            return set()
+        angles[name] = angle
+        return {name}
+    if key == "[":
+        state["step"] = max(0, state["step"] - 1)
+    elif key == "]":
+        state["step"] = min(len(STEP_SIZES) - 1, state["step"] + 1)
+    elif key == "c":
+        for name in angles:
+            angles[name] = 90
+        return set(angles)
+    elif key in ("p", "l"):
+        state["prompt"] = "save" if key == "p" else "load"
+        print()
+        print_prompt(state)
+    elif key == "x":
+        sc.release_all_servos()
+    elif key == "\x1b":
+        state["quit"] = True
+    return set()
+
+
+def apply_gamepad(state, dev, dt):
+    """Move servos proportionally to stick deflection over dt seconds"""
+    moved = set()
+    for axis, name in GAMEPAD_AXES.items():
+        value = dev.axis_values.get(axis, 0.0)
+        if value:
+            angle = clamp(state["angles"][name] + value * GAMEPAD_SPEED * dt)
+            if angle != state["angles"][name]:
+                state["angles"][name] = angle
+                moved.add(name)
+    return moved
+
+
+def print_prompt(state):
+    """Redraw the pose name prompt (cbreak mode turns off terminal echo)"""
+    print(f"\r{state['prompt'].capitalize()} pose name: {state['buffer']} ", end="", flush=True)
+
+
+def print_status(state):
+    angles = state["angles"]
+    text = "  ".join(f"{name}={angles[name]:5.1f}" for name in sc.SERVOS)
+    print(f"\r{text}  step={STEP_SIZES[state['step']]}   ", end="", flush=True)
+
+
+# --- Control loop ---
+
+def jog(key_fd, gamepad=None, state=None, max_ticks=None, poses_file=sc.POSES_FILE):
+    """
+    Run the jog loop until Esc (or max_ticks control ticks have passed).
+
+    Waits on the key/gamepad file descriptors until the next tick so a
+    keystroke is handled as soon as it arrives. All servos moved by the
+    input gathered in one wake-up go out in a single batched write.
+    """
+    if state is None:
+        state = new_state()
+    period = 1.0 / CONTROL_HZ
+    fds = [key_fd] + ([gamepad.fd] if gamepad else [])
+
+    sc.set_servo_angles(state["angles"])
+    print_status(state)
+
+    last = time.monotonic()
+    next_tick = last + period
+    ticks = 0
+    while not state["quit"]:
+        timeout = max(0.0, next_tick - time.monotonic())
+        ready = select.select(fds, [], [], timeout)[0]
+
+        moved = set()
+        if key_fd in ready:
+            keys = read_keys(key_fd)
+            if keys is None:  # end of input, nothing more will ever arrive
+                state["quit"] = True
+                keys = ""
+            for key in keys:
+                moved |= handle_key(state, key, poses_file)
+
+        now = time.monotonic()
+        if gamepad:
+            if gamepad.fd in ready and not read_gamepad(gamepad):
+                gamepad = None
+                fds = [key_fd]
+            else:
+                moved |= apply_gamepad(state, gamepad, now - last)
+        last = now
+
+        if moved:
+            sc.set_servo_angles({name: state["angles"][name] for name in moved})
+            if not state["prompt"]:
+                print_status(state)
+
+        if now >= next_tick:
+            next_tick += period
+            if next_tick < now:  # fell behind, don't try to catch up
+                next_tick = now + period
+            ticks += 1
+            if max_ticks is not None and ticks >= max_ticks:
+                break
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live servo jog console")
+    parser.add_argument("--sim", action="store_true", help="use the simulated PCA9685")
+    parser.add_argument("--gamepad", help="evdev device path, e.g. /dev/input/event0")
+    parser.add_argument("--poses", default=sc.POSES_FILE, help="pose file to save/load")
+    args = parser.parse_args()
+
+    try:
+        sc.init_servos(simulate=args.sim)
+    except ValueError:
+        print("Error: Could not initialize I2C bus. Is the PCA9685 connected and enabled?")
+        print("Ensure I2C is enabled on your Raspberry Pi via 'sudo raspi-config'.")
+        return
+
+    gamepad = open_gamepad(args.gamepad) if args.gamepad else None
+    print(HELP)
+
+    fd = sys.stdin.fileno()
+    old_attrs = None
+    if os.isatty(fd):
+        import termios, tty
+        old_attrs = termios.tcgetattr(fd)
+        tty.setcbreak(fd)  # raw keystrokes, Ctrl+C still works
+    try:
+        jog(fd, gamepad, poses_file=args.poses)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if old_attrs is not None:
+            termios.tcsetattr(fd, termios.TCSADRAIN, old_attrs)
+        print("\nExiting jog console.")
+        sc.cleanup()
 
-            # Set the servo angle
-            print(f"Moving servo '{name_input}' to {angle} degrees...")
-            servo_data["object"].angle = angle
-            
-        except KeyboardInterrupt:
-            # Handle Ctrl+C gracefully
-            print("\nExiting interactive control.")
-            break
-        except Exception as e:
-            print(f"An unexpected error occurred: {e}")
-            print("Please try again or restart the script.")
 
-# Run the interactive control function
 if __name__ == "__main__":
-    interactive_control()
+    main()
@@ -0,0 +1,134 @@
+# virtualClock.py
+# Headless test harness: runs servo code against the simulated PCA9685 with
+# time.sleep()/time.monotonic() replaced by a virtual clock, so a gait that
+# takes minutes on the robot finishes in milliseconds and every duty write
+# lands at an exact, repeatable timestamp. select.select() timeouts advance
+# the clock too, and events (e.g. a keystroke) can be scheduled at a
+# virtual time, so the jog console's control loop runs on it as well.
+#
+#     writes, clock = run_headless(sc.crawling_gait, cycles=100)
+#     assert abs(clock.now - 366.0) < 1e-6
+import contextlib
+import heapq
+import io
+import itertools
+import os
+import select
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "code"))
+import servoController as sc
+
+_PATCHED = ("sleep", "monotonic", "perf_counter", "time")
+
+
+class VirtualClock:
+    """
+    Stand-in for the time module's clocks; sleep() just advances now.
+
+    select.select() polls the real fds without waiting and, if none are
+    ready, advances now by its timeout (or to the next scheduled event,
+    whichever comes first).
+    """
+
+    def __init__(self, start=0.0):
+        self.now = start
+        self._events = []  # heap of (time, seq, func)
+        self._seq = itertools.count()
+        self._saved = {}
+        self._real_select = select.select
+
+    def at(self, t, func):
+        """Call func() when the virtual clock reaches time t"""
+        heapq.heappush(self._events, (t, next(self._seq), func))
+
+    def _fire_next(self):
+        t, _, func = heapq.heappop(self._events)
+        self.now = max(self.now, t)
+        func()
+
+    def sleep(self, seconds):
+        if seconds < 0:
+            raise ValueError("sleep length must be non-negative")
+        end = self.now + seconds
+        while self._events and self._events[0][0] <= end:
+            self._fire_next()
+        self.now = end
+
+    def monotonic(self):
+        return self.now
+
+    perf_counter = monotonic
+    time = monotonic
+
+    def select(self, rlist, wlist, xlist, timeout=None):
+        ready = self._real_select(rlist, wlist, xlist, 0)
+        end = None if timeout is None else self.now + timeout
+        while not any(ready) and self._events and (end is None or self._events[0][0] <= end):
+            self._fire_next()
+            ready = self._real_select(rlist, wlist, xlist, 0)
+        if any(ready):
+            return ready
+        if end is None:
+            raise RuntimeError("select() with no timeout would block forever on the virtual clock")
+        self.now = max(self.now, end)
+        return ready
+
+    def __enter__(self):
+        for name in _PATCHED:
+            self._saved[(time, name)] = getattr(time, name)
+            setattr(time, name, getattr(self, name))
+        self._saved[(select, "select")] = select.select
+        select.select = self.select
+        return self
+
+    def __exit__(self, *exc):
+        for (module, name), func in self._saved.items():
+            setattr(module, name, func)
+        self._saved.clear()
+        return False
+
+
+def run_headless(func, *args, quiet=True, events=(), **kwargs):
+    """
+    Call func(*args, **kwargs) on a fresh simulated PCA9685 under a virtual clock.
+
+    events is a list of (virtual time, callable) to fire while func runs.
+    Returns (writes, clock) where writes is the list of
+    (virtual time, channel, duty_cycle) the code produced.
+    """
+    with VirtualClock() as clock:
+        for t, event in events:
+            clock.at(t, event)
+        with contextlib.redirect_stdout(io.StringIO() if quiet else sys.stdout):
+            sc.init_servos(simulate=True)
+            func(*args, **kwargs)
+    return sc.pca.writes, clock
+
+
+def duty(servo_name, angle):
+    """duty_cycle value servoController writes for an angle"""
+    return sc.angle_to_pwm(angle, servo_name) << 4
+
+
+def expected_move(t, start, targets, speed=0.01, steps=10):
+    """
+    Writes move_servos(targets, speed, steps) should produce from time t,
+    given the start angle of each servo. Returns (writes, end time).
+    """
+    writes = []
+    for i in range(steps + 1):
+        for name in sorted(targets, key=lambda n: sc.SERVOS[n]["channel"]):
+            angle = start[name] + (targets[name] - start[name]) * i / steps
+            writes.append((t, sc.SERVOS[name]["channel"], duty(name, angle)))
+        t += speed
+    return writes, t
+
+
+def assert_writes(actual, expected, tol=1e-6):
+    """Compare two write logs entry by entry, timestamps within tol"""
+    assert len(actual) == len(expected), f"{len(actual)} writes, expected {len(expected)}"
+    for i, ((ta, ca, da), (te, ce, de)) in enumerate(zip(actual, expected)):
+        assert abs(ta - te) <= tol and ca == ce and da == de, \
+            f"write {i}: got ({ta:.4f}, ch{ca}, {da}), expected ({te:.4f}, ch{ce}, {de})"